@@ -1,23 +1,38 @@
-import requests
 import logging
 import sqlite3
 import os
 
+from agents.ingestion_client import IngestionClient, IngestionError
+from agents.work_queue import WorkQueue
+
 DB_PATH = os.path.join("database", "support_emails.db")
-API_URL = "https://customer-support-crew.onrender.com/new_email"
+
+# Shared pooled client so repeated runs reuse keep-alive connections.
+client = IngestionClient()
 
 def run():
     logging.info("Email Ingestion Agent: Fetching new email...")
 
     try:
-        response = requests.get(API_URL, timeout=60)
-        response.raise_for_status()
-        email = response.json()
+        email = client.fetch_email()
         logging.info("Email Ingestion Agent: Fetched email from API.")
-    except Exception as e:
+    except IngestionError as e:
         logging.error(f"Email Ingestion Agent: Error fetching email: {e}")
         return None
 
+    return store_email(email)
+
+def store_email(email):
+    """
+    Insert a fetched email into the database under a fresh email_id and
+    enqueue it for the processing agents in the same transaction.
+    Args:
+        email (dict): Email data returned by the API.
+    Returns:
+        dict: The same email with its new `email_id`.
+    """
+    work_queue = WorkQueue(DB_PATH)
+
     # Always insert a new row with a new email_id, even if content is reused
     conn = sqlite3.connect(DB_PATH)
     cur = conn.cursor()
@@ -40,10 +55,11 @@ def run():
             email["body"],
         ),
     )
+    work_queue.enqueue(new_id, conn=conn)
     conn.commit()
     conn.close()
 
-    logging.info(f"Email Ingestion Agent: Inserted email with new ID {new_id}.")
+    logging.info(f"Email Ingestion Agent: Inserted and enqueued email with new ID {new_id}.")
 
     # Ensure downstream agents receive the new ID
     email["email_id"] = new_id
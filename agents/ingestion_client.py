@@ -0,0 +1,331 @@
+import asyncio
+import logging
+import os
+import queue
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_BASE_URL = "https://customer-support-crew.onrender.com"
+BASE_URL = os.environ.get("INGESTION_API_BASE_URL", DEFAULT_BASE_URL)
+EMAIL_ENDPOINT = "/new_email"
+
+# Status codes worth retrying: rate limiting and server-side/cold-start errors.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class IngestionError(Exception):
+    """Raised when an email could not be fetched from the API."""
+
+
+class CircuitOpenError(IngestionError):
+    """Raised when the circuit breaker is open and calls are short-circuited."""
+
+
+def backoff_delay(attempt, base=1.0, cap=30.0):
+    """
+    Exponential backoff with full jitter.
+    Args:
+        attempt (int): Zero-based retry attempt.
+        base (float): Delay of the first attempt in seconds.
+        cap (float): Upper bound on the delay in seconds.
+    Returns:
+        float: Seconds to sleep before the next attempt.
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Simple closed/open/half-open circuit breaker.
+
+    Failures are counted per `fetch_email` call that exhausted its retries,
+    not per attempt. After `failure_threshold` consecutive failed calls the
+    circuit opens and every call fails fast for `reset_timeout` seconds. The
+    first call after that is let through as a single trial while others keep
+    failing fast; success closes the circuit, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_call(self):
+        """Raise CircuitOpenError if calls are currently short-circuited."""
+        with self._lock:
+            state = self.state
+            if state == self.OPEN or (state == self.HALF_OPEN and self.trial_in_flight):
+                raise CircuitOpenError("Circuit breaker is open; skipping API call.")
+            if state == self.HALF_OPEN:
+                self.trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                if self.opened_at is None:
+                    logging.warning("Ingestion Client: Circuit breaker opened after %d failures.", self.failures)
+                self.opened_at = time.monotonic()
+
+
+class _BaseClient:
+    """Configuration and retry bookkeeping shared by the sync and async clients."""
+
+    def __init__(self, base_url=None, timeout=60, max_retries=5, backoff_base=1.0,
+                 backoff_cap=30.0, pool_size=10, breaker=None):
+        self.base_url = (base_url or BASE_URL).rstrip("/")
+        self.url = self.base_url + EMAIL_ENDPOINT
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.pool_size = pool_size
+        self.breaker = breaker or CircuitBreaker()
+
+    def _next_delay(self, attempt, error):
+        """Return the delay before retrying a failed attempt, or raise once retries are exhausted."""
+        if attempt >= self.max_retries:
+            self.breaker.record_failure()
+            raise IngestionError(f"Giving up after {attempt + 1} attempts: {error}") from error
+        delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+        logging.warning("Ingestion Client: Attempt %d failed (%s); retrying in %.1fs.",
+                        attempt + 1, error, delay)
+        return delay
+
+
+class IngestionClient(_BaseClient):
+    """
+    Synchronous client for the `/new_email` endpoint.
+
+    Uses a pooled keep-alive `requests.Session`, retries transient failures
+    with jittered exponential backoff and guards the API with a circuit breaker.
+    """
+
+    def __init__(self, base_url=None, session=None, **kwargs):
+        super().__init__(base_url, **kwargs)
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch_email(self):
+        """
+        Fetch a single email, retrying transient errors.
+        Returns:
+            dict: Email data returned by the API.
+        Raises:
+            IngestionError: If the email could not be fetched.
+        """
+        self.breaker.before_call()
+        attempt = 0
+        while True:
+            try:
+                response = self.session.get(self.url, timeout=self.timeout)
+                if response.status_code in RETRY_STATUSES:
+                    raise IngestionError(f"HTTP {response.status_code}")
+                response.raise_for_status()
+                email = response.json()
+            except (requests.ConnectionError, requests.Timeout, IngestionError) as e:
+                time.sleep(self._next_delay(attempt, e))
+                attempt += 1
+                continue
+            except (requests.RequestException, ValueError) as e:
+                # Non-retryable: 4xx responses or malformed JSON.
+                self.breaker.record_failure()
+                raise IngestionError(f"Error fetching email: {e}") from e
+            self.breaker.record_success()
+            return email
+
+    def fetch_batch(self, count):
+        """
+        Fetch `count` emails concurrently over the pooled session.
+        Args:
+            count (int): Number of emails to fetch.
+        Returns:
+            list: Email dicts in submission order.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(count, self.pool_size) or 1) as executor:
+            return list(executor.map(lambda _: self.fetch_email(), range(count)))
+
+    def iter_emails(self, count, prefetch=4):
+        """
+        Yield `count` emails while the next `prefetch` are fetched in the background.
+        Args:
+            count (int): Total number of emails to yield.
+            prefetch (int): Size of the local look-ahead buffer.
+        Yields:
+            dict: Email data.
+        """
+        buffer = queue.Queue(maxsize=max(prefetch, 1))
+        stop = threading.Event()
+
+        def producer():
+            for _ in range(count):
+                if stop.is_set():
+                    return
+                try:
+                    item = self.fetch_email()
+                except IngestionError as e:
+                    item = e
+                buffer.put(item)
+                if isinstance(item, IngestionError):
+                    return
+
+        worker = threading.Thread(target=producer, name="ingestion-prefetch", daemon=True)
+        worker.start()
+        try:
+            for _ in range(count):
+                item = buffer.get()
+                if isinstance(item, IngestionError):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            # Unblock the producer if it is waiting on a full buffer.
+            while not buffer.empty():
+                buffer.get_nowait()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncIngestionClient(_BaseClient):
+    """
+    asyncio variant of IngestionClient built on a pooled `aiohttp` session.
+    """
+
+    def __init__(self, base_url=None, keepalive_timeout=30, **kwargs):
+        super().__init__(base_url, **kwargs)
+        self.keepalive_timeout = keepalive_timeout
+        self.session = None
+
+    async def open(self):
+        import aiohttp
+
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=self.keepalive_timeout)
+            self.session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self
+
+    async def fetch_email(self):
+        """
+        Fetch a single email, retrying transient errors.
+        Returns:
+            dict: Email data returned by the API.
+        Raises:
+            IngestionError: If the email could not be fetched.
+        """
+        import aiohttp
+
+        await self.open()
+        self.breaker.before_call()
+        attempt = 0
+        while True:
+            try:
+                async with self.session.get(self.url) as response:
+                    if response.status in RETRY_STATUSES:
+                        raise IngestionError(f"HTTP {response.status}")
+                    response.raise_for_status()
+                    email = await response.json()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError, IngestionError) as e:
+                await asyncio.sleep(self._next_delay(attempt, e))
+                attempt += 1
+                continue
+            except (aiohttp.ClientError, ValueError) as e:
+                self.breaker.record_failure()
+                raise IngestionError(f"Error fetching email: {e}") from e
+            self.breaker.record_success()
+            return email
+
+    async def fetch_batch(self, count):
+        """
+        Fetch `count` emails concurrently, bounded by the connection pool size.
+        Args:
+            count (int): Number of emails to fetch.
+        Returns:
+            list: Email dicts.
+        """
+        semaphore = asyncio.Semaphore(self.pool_size)
+
+        async def bounded():
+            async with semaphore:
+                return await self.fetch_email()
+
+        return await asyncio.gather(*(bounded() for _ in range(count)))
+
+    async def iter_emails(self, count, prefetch=4):
+        """
+        Yield `count` emails while the next `prefetch` are fetched in the background.
+        Args:
+            count (int): Total number of emails to yield.
+            prefetch (int): Size of the local look-ahead buffer.
+        Yields:
+            dict: Email data.
+        """
+        buffer = asyncio.Queue(maxsize=max(prefetch, 1))
+
+        async def producer():
+            for _ in range(count):
+                try:
+                    item = await self.fetch_email()
+                except IngestionError as e:
+                    await buffer.put(e)
+                    return
+                await buffer.put(item)
+
+        task = asyncio.ensure_future(producer())
+        try:
+            for _ in range(count):
+                item = await buffer.get()
+                if isinstance(item, IngestionError):
+                    raise item
+                yield item
+        finally:
+            task.cancel()
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc):
+        await self.close()
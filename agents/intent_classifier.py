@@ -1,12 +1,34 @@
-import pickle
 import os
+import time
 import logging
 
+from agents.model_registry import ServedModel, ShadowRecorder
+
 MODEL_PATH = os.path.join('models', 'intent_classifier.pkl')
 
-# Load the model once for efficiency.
-with open(MODEL_PATH, 'rb') as f:
-    model = pickle.load(f)
+# Load the model once for efficiency; later registry promotions are hot-swapped in.
+served = ServedModel(fallback_path=MODEL_PATH)
+shadow = ShadowRecorder()
+
+def configure_shadow(db_path):
+    """Record shadow comparisons in `db_path` instead of the production database."""
+    shadow.db_path = db_path
+
+def predict(texts):
+    """
+    Predict with the active model, mirroring the call to the shadow candidate if one is set.
+    Args:
+        texts (list): Lowercased subject + body strings.
+    Returns:
+        list: Predicted intent labels.
+    """
+    (active_version, model), (candidate_version, candidate) = served.get()
+    start = time.perf_counter()
+    labels = list(model.predict(texts))
+    active_ms = (time.perf_counter() - start) * 1000 / len(texts)
+    if candidate is not None:
+        shadow.submit(active_version, labels, active_ms, candidate_version, candidate, texts)
+    return labels
 
 def run(email):
     """
@@ -18,7 +40,19 @@ def run(email):
     """
     logging.info("Intent Classifier Agent: Classifying email intent...")
     text = (email.get("subject", "") + " " + email.get("body", "")).lower()
-    predicted_intent = model.predict([text])[0]
+    predicted_intent = predict([text])[0]
     logging.info("Intent Classifier Agent: Predicted intent: %s", predicted_intent)
     return predicted_intent
 
+def run_batch(emails):
+    """
+    Classify a batch of emails with a single vectorized model call.
+    Args:
+        emails (list): Email dicts.
+    Returns:
+        list: Predicted intent labels, in input order.
+    """
+    texts = [(email.get("subject", "") + " " + email.get("body", "")).lower() for email in emails]
+    if not texts:
+        return []
+    return predict(texts)
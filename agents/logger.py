@@ -1,9 +1,11 @@
 import os
+import fcntl
 import sqlite3
 import logging
 import datetime
 
 DB_PATH = os.path.join('database', 'support_emails.db')
+FRONTEND_PATH = os.path.join('docs', 'index.html')
 
 def run(email, intent, urgency, response):
     logging.info("Logger Agent: Logging processed email...")
@@ -44,15 +46,21 @@ def update_frontend(email, intent, urgency, response):
     </div>
     """
 
-    with open("docs/index.html", "r") as f:
-        content = f.read()
+    # Several queue workers may log at once: serialize the read-modify-write with a
+    # lock file and swap the page in atomically so readers never see it truncated.
+    with open(FRONTEND_PATH + ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        with open(FRONTEND_PATH, "r") as f:
+            content = f.read()
 
-    updated = content.replace(
-        "<!-- End of logs -->",
-        html_entry + "\n<!-- End of logs -->"
-    )
+        updated = content.replace(
+            "<!-- End of logs -->",
+            html_entry + "\n<!-- End of logs -->"
+        )
 
-    with open("docs/index.html", "w") as f:
-        f.write(updated)
+        tmp_path = f"{FRONTEND_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(updated)
+        os.replace(tmp_path, FRONTEND_PATH)
 
     logging.info("Logger Agent: Frontend updated.")
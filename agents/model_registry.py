@@ -0,0 +1,309 @@
+import argparse
+import datetime
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REGISTRY_DIR = os.path.join("models", "registry")
+LEGACY_MODEL_PATH = os.path.join("models", "intent_classifier.pkl")
+DB_PATH = os.path.join("database", "support_emails.db")
+
+ACTIVE = "ACTIVE"
+CANDIDATE = "CANDIDATE"
+
+SHADOW_SCHEMA = """
+CREATE TABLE IF NOT EXISTS model_shadow_log (
+    logged_at REAL NOT NULL,
+    active_version TEXT NOT NULL,
+    candidate_version TEXT NOT NULL,
+    active_label TEXT,
+    candidate_label TEXT,
+    agree INTEGER NOT NULL,
+    active_ms REAL NOT NULL,
+    candidate_ms REAL NOT NULL
+);
+"""
+
+
+def _atomic_write(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class ModelRegistry:
+    """
+    Versioned store of intent classifier artifacts.
+
+    Each version is the pickled model saved as `<version>.pkl`, where the
+    version is a prefix of the SHA-256 of its bytes, next to a `<version>.json`
+    metadata file. The `ACTIVE` and `CANDIDATE` files point at the version
+    served to traffic and the one evaluated in shadow mode; both are swapped
+    with an atomic rename so readers never see a partial update.
+    """
+
+    def __init__(self, registry_dir=REGISTRY_DIR):
+        self.registry_dir = registry_dir
+
+    def _path(self, name):
+        return os.path.join(self.registry_dir, name)
+
+    def register(self, model, metadata=None):
+        """
+        Store a model and its metadata.
+        Args:
+            model: Fitted model to pickle.
+            metadata (dict): e.g. training rows, metrics and inference latency.
+        Returns:
+            str: Content-hash version of the stored artifact.
+        """
+        os.makedirs(self.registry_dir, exist_ok=True)
+        data = pickle.dumps(model)
+        version = hashlib.sha256(data).hexdigest()[:16]
+        if not os.path.exists(self._path(version + ".pkl")):
+            _atomic_write(self._path(version + ".pkl"), data)
+        metadata = dict(metadata or {})
+        metadata.update({
+            "version": version,
+            "size_bytes": len(data),
+            "registered_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        })
+        _atomic_write(self._path(version + ".json"), json.dumps(metadata, indent=2).encode())
+        logging.info("Model Registry: Registered version %s.", version)
+        return version
+
+    def versions(self):
+        """Return metadata of every registered version, oldest first."""
+        versions = []
+        if not os.path.isdir(self.registry_dir):
+            return versions
+        for name in os.listdir(self.registry_dir):
+            if name.endswith(".json"):
+                with open(self._path(name), "r") as f:
+                    versions.append(json.load(f))
+        return sorted(versions, key=lambda m: m.get("registered_at", ""))
+
+    def metadata(self, version):
+        with open(self._path(version + ".json"), "r") as f:
+            return json.load(f)
+
+    def load(self, version):
+        with open(self._path(version + ".pkl"), "rb") as f:
+            return pickle.load(f)
+
+    def pointer(self, name):
+        """Return the version the `ACTIVE` or `CANDIDATE` pointer refers to, or None."""
+        try:
+            with open(self._path(name), "r") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def set_pointer(self, name, version):
+        if version is None:
+            if os.path.exists(self._path(name)):
+                os.remove(self._path(name))
+            return
+        if not os.path.exists(self._path(version + ".pkl")):
+            raise ValueError(f"Unknown model version: {version}")
+        _atomic_write(self._path(name), version.encode())
+        logging.info("Model Registry: %s -> %s.", name, version)
+
+    def bootstrap(self, legacy_path=LEGACY_MODEL_PATH):
+        """
+        Register the pre-registry model file as the first ACTIVE version.
+        Does nothing once a version is active or if the file does not exist.
+        Returns:
+            str: The active version, or None.
+        """
+        if self.pointer(ACTIVE) is None and os.path.exists(legacy_path):
+            with open(legacy_path, "rb") as f:
+                model = pickle.load(f)
+            self.set_pointer(ACTIVE, self.register(model, {"source": legacy_path, "bootstrapped": True}))
+        return self.pointer(ACTIVE)
+
+    def promote(self, version):
+        """Make `version` active, clearing it as the shadow candidate if it was one."""
+        self.set_pointer(ACTIVE, version)
+        if self.pointer(CANDIDATE) == version:
+            self.set_pointer(CANDIDATE, None)
+
+
+class ServedModel:
+    """
+    Hot-swappable handle to the active model (and shadow candidate).
+
+    `get()` re-reads the registry pointers at most every `check_interval`
+    seconds. A new version is loaded before the reference is replaced, so
+    requests already holding the old model finish on it and none are dropped.
+    Falls back to `models/intent_classifier.pkl`, the last promoted model,
+    until `train_model.py` has bootstrapped the registry.
+    """
+
+    def __init__(self, registry=None, check_interval=5.0, fallback_path=LEGACY_MODEL_PATH):
+        self.registry = registry or ModelRegistry()
+        self.check_interval = check_interval
+        self.fallback_path = fallback_path
+        self.active = (None, None)
+        self.candidate = (None, None)
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        """Reload the active/candidate models if their pointers changed."""
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self):
+        self._checked_at = time.monotonic()
+        active_version = self.registry.pointer(ACTIVE)
+        if active_version is None and self.active[1] is None:
+            with open(self.fallback_path, "rb") as f:
+                self.active = ("legacy", pickle.load(f))
+        elif active_version is not None and active_version != self.active[0]:
+            self.active = (active_version, self.registry.load(active_version))
+            logging.info("Model Registry: Serving model version %s.", active_version)
+
+        candidate_version = self.registry.pointer(CANDIDATE)
+        if candidate_version is None:
+            self.candidate = (None, None)
+        elif candidate_version != self.candidate[0]:
+            self.candidate = (candidate_version, self.registry.load(candidate_version))
+            logging.info("Model Registry: Shadowing candidate version %s.", candidate_version)
+
+    def get(self):
+        """
+        Returns:
+            tuple: ((active_version, active_model), (candidate_version, candidate_model)).
+        """
+        # Only one caller reloads; the others keep serving the current models meanwhile.
+        if time.monotonic() - self._checked_at >= self.check_interval and self._lock.acquire(blocking=False):
+            try:
+                self._refresh()
+            except Exception as e:
+                # Keep serving the current model if the new one cannot be loaded.
+                logging.error("Model Registry: Failed to refresh models: %s", e)
+            finally:
+                self._lock.release()
+        return self.active, self.candidate
+
+
+class ShadowRecorder:
+    """
+    Runs the candidate model off the request path and logs agreement and
+    per-model latency to the `model_shadow_log` table.
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self._executor = None
+        self._pid = None
+        self._initialized = False
+
+    def _get_executor(self):
+        # Recreate after fork: the parent's worker thread does not exist in the child.
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+            self._pid = os.getpid()
+        return self._executor
+
+    def submit(self, active_version, active_labels, active_ms, candidate_version, candidate_model, texts):
+        """Predict `texts` with the candidate in the background and record the comparison."""
+        self._get_executor().submit(
+            self._evaluate, active_version, list(active_labels), active_ms,
+            candidate_version, candidate_model, texts,
+        )
+
+    def _evaluate(self, active_version, active_labels, active_ms, candidate_version, candidate_model, texts):
+        try:
+            start = time.perf_counter()
+            candidate_labels = candidate_model.predict(texts)
+            # Latency is recorded per email so single and batch calls are comparable.
+            candidate_ms = (time.perf_counter() - start) * 1000 / len(texts)
+            now = time.time()
+            rows = [
+                (now, active_version, candidate_version, str(a), str(c), int(a == c), active_ms, candidate_ms)
+                for a, c in zip(active_labels, candidate_labels)
+            ]
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            if not self._initialized:
+                conn.executescript(SHADOW_SCHEMA)
+                self._initialized = True
+            conn.executemany("INSERT INTO model_shadow_log VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logging.error("Model Registry: Shadow evaluation failed: %s", e)
+
+    def flush(self):
+        """Wait for pending shadow evaluations to be recorded."""
+        self._get_executor().submit(lambda: None).result()
+
+
+def shadow_report(db_path=DB_PATH, candidate_version=None):
+    """
+    Summarize shadow traffic per (active, candidate) pair.
+    Returns:
+        list: Dicts with `samples`, `agreement_rate`, `active_ms` and `candidate_ms` (mean per email).
+    """
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SHADOW_SCHEMA)
+    query = (
+        "SELECT active_version, candidate_version, COUNT(*), AVG(agree), AVG(active_ms), AVG(candidate_ms) "
+        "FROM model_shadow_log"
+    )
+    params = ()
+    if candidate_version:
+        query += " WHERE candidate_version = ?"
+        params = (candidate_version,)
+    rows = conn.execute(query + " GROUP BY active_version, candidate_version", params).fetchall()
+    conn.close()
+    return [
+        {
+            "active_version": active, "candidate_version": candidate, "samples": samples,
+            "agreement_rate": round(agree, 4), "active_ms": round(active_ms, 3), "candidate_ms": round(candidate_ms, 3),
+        }
+        for active, candidate, samples, agree, active_ms, candidate_ms in rows
+    ]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Manage intent classifier model versions.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List registered versions")
+    promote = sub.add_parser("promote", help="Serve a version to all traffic")
+    promote.add_argument("version")
+    shadow = sub.add_parser("shadow", help="Evaluate a version alongside the active one")
+    shadow.add_argument("version")
+    sub.add_parser("unshadow", help="Stop shadow evaluation")
+    report = sub.add_parser("report", help="Show shadow agreement rate and latency")
+    report.add_argument("--version", default=None)
+
+    args = parser.parse_args()
+    registry = ModelRegistry()
+    if args.command == "list":
+        active, candidate = registry.pointer(ACTIVE), registry.pointer(CANDIDATE)
+        for meta in registry.versions():
+            marker = "*" if meta["version"] == active else ("s" if meta["version"] == candidate else " ")
+            print(marker, json.dumps(meta))
+    elif args.command == "promote":
+        registry.promote(args.version)
+    elif args.command == "shadow":
+        registry.set_pointer(CANDIDATE, args.version)
+    elif args.command == "unshadow":
+        registry.set_pointer(CANDIDATE, None)
+    elif args.command == "report":
+        for row in shadow_report(candidate_version=args.version):
+            print(json.dumps(row))
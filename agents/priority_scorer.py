@@ -10,16 +10,22 @@ def run(email):
         int: Urgency score (0, 1, or 2).
     """
     logging.info("Priority Scorer Agent: Scoring email urgency...")
-    body = email.get("body", "")
-    blob = TextBlob(body)
-    polarity = blob.sentiment.polarity
-    # Heuristic: lower polarity (more negative) means higher urgency.
-    if polarity < -0.5:
-        urgency = 2
-    elif polarity < 0:
-        urgency = 1
-    else:
-        urgency = 0
+    urgency = score(email.get("body", ""))
     logging.info("Priority Scorer Agent: Urgency score: %d", urgency)
     return urgency
 
+def score(body):
+    """
+    Map the sentiment polarity of an email body to an urgency score.
+    Args:
+        body (str): Email body text.
+    Returns:
+        int: Urgency score (0, 1, or 2).
+    """
+    polarity = TextBlob(body or "").sentiment.polarity
+    # Heuristic: lower polarity (more negative) means higher urgency.
+    if polarity < -0.5:
+        return 2
+    elif polarity < 0:
+        return 1
+    return 0
@@ -0,0 +1,192 @@
+import logging
+import os
+import socket
+import sqlite3
+import time
+
+DB_PATH = os.path.join("database", "support_emails.db")
+QUEUE_SCHEMA_PATH = os.path.join("database", "queue_schema.sql")
+
+PENDING = "pending"
+DEAD = "dead"
+
+
+class WorkQueue:
+    """
+    Durable SQLite-backed work queue between ingestion and the processing agents.
+
+    Items are email_ids. `lease` hands out a batch and hides it for
+    `visibility_timeout` seconds; if the worker does not `ack` in time the
+    items become visible again. Items leased more than `max_attempts` times
+    are moved to the dead-letter list instead of being handed out again.
+    """
+
+    def __init__(self, db_path=DB_PATH, visibility_timeout=300, max_attempts=3):
+        self.db_path = db_path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        with open(QUEUE_SCHEMA_PATH, "r") as f:
+            schema = f.read()
+        conn = self.connect()
+        conn.executescript(schema)
+        conn.close()
+
+    def connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def enqueue(self, email_id, conn=None):
+        """
+        Add an email to the queue. Pass `conn` to enqueue inside the caller's transaction.
+        Args:
+            email_id (int): ID of a row in `support_emails`.
+            conn (sqlite3.Connection): Optional open connection; the caller commits.
+        """
+        own_conn = conn is None
+        if own_conn:
+            conn = self.connect()
+        now = time.time()
+        conn.execute(
+            "INSERT OR IGNORE INTO email_queue (email_id, enqueued_at, visible_at) VALUES (?, ?, ?)",
+            (email_id, now, now),
+        )
+        if own_conn:
+            conn.commit()
+            conn.close()
+
+    def lease(self, batch_size=10):
+        """
+        Lease up to `batch_size` visible emails.
+        Returns:
+            list: Email dicts (full `support_emails` rows) now owned by this worker.
+        """
+        now = time.time()
+        conn = self.connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            # IMMEDIATE takes the write lock up front so concurrent workers never lease the same rows.
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "UPDATE email_queue SET status = ?, last_error = COALESCE(last_error, 'lease expired') "
+                "WHERE status = ? AND visible_at <= ? AND attempts >= ?",
+                (DEAD, PENDING, now, self.max_attempts),
+            )
+            ids = [row["email_id"] for row in conn.execute(
+                "SELECT email_id FROM email_queue WHERE status = ? AND visible_at <= ? "
+                "ORDER BY enqueued_at, email_id LIMIT ?",
+                (PENDING, now, batch_size),
+            )]
+            if not ids:
+                conn.commit()
+                return []
+            placeholders = ",".join("?" * len(ids))
+            conn.execute(
+                f"UPDATE email_queue SET visible_at = ?, lease_owner = ?, attempts = attempts + 1 "
+                f"WHERE email_id IN ({placeholders})",
+                (now + self.visibility_timeout, self.owner, *ids),
+            )
+            emails = [dict(row) for row in conn.execute(
+                f"SELECT email_id, timestamp, sender, subject, body FROM support_emails "
+                f"WHERE email_id IN ({placeholders}) ORDER BY email_id",
+                ids,
+            )]
+            conn.commit()
+        finally:
+            conn.close()
+        logging.info("Work Queue: Leased %d email(s) to %s.", len(emails), self.owner)
+        return emails
+
+    def ack(self, email_ids):
+        """Remove successfully processed emails from the queue."""
+        email_ids = list(email_ids)
+        if not email_ids:
+            return
+        conn = self.connect()
+        conn.execute(
+            f"DELETE FROM email_queue WHERE email_id IN ({','.join('?' * len(email_ids))})",
+            email_ids,
+        )
+        conn.commit()
+        conn.close()
+
+    def fail(self, email_id, error):
+        """
+        Record a processing failure. The email is retried after the visibility
+        timeout, or dead-lettered once it has used up `max_attempts`.
+        """
+        conn = self.connect()
+        conn.execute(
+            "UPDATE email_queue SET last_error = ?, lease_owner = NULL, "
+            "status = CASE WHEN attempts >= ? THEN ? ELSE status END "
+            "WHERE email_id = ?",
+            (str(error), self.max_attempts, DEAD, email_id),
+        )
+        conn.commit()
+        conn.close()
+
+    def dead_letters(self):
+        """Return dead-lettered items as (email_id, attempts, last_error) tuples."""
+        conn = self.connect()
+        rows = conn.execute(
+            "SELECT email_id, attempts, last_error FROM email_queue WHERE status = ? ORDER BY email_id",
+            (DEAD,),
+        ).fetchall()
+        conn.close()
+        return rows
+
+    def requeue_dead(self):
+        """Move every dead-lettered item back to the queue with a fresh attempt count."""
+        conn = self.connect()
+        cur = conn.execute(
+            "UPDATE email_queue SET status = ?, attempts = 0, visible_at = ?, lease_owner = NULL "
+            "WHERE status = ?",
+            (PENDING, time.time(), DEAD),
+        )
+        conn.commit()
+        conn.close()
+        return cur.rowcount
+
+    def recover(self):
+        """
+        Enqueue emails that were stored but never processed (NULL `intent_label`),
+        e.g. rows left behind by a crash before the queue existed.
+        Returns:
+            int: Number of emails recovered.
+        """
+        now = time.time()
+        conn = self.connect()
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO email_queue (email_id, enqueued_at, visible_at) "
+            "SELECT email_id, ?, ? FROM support_emails WHERE intent_label IS NULL",
+            (now, now),
+        )
+        conn.commit()
+        conn.close()
+        if cur.rowcount:
+            logging.info("Work Queue: Recovered %d unprocessed email(s).", cur.rowcount)
+        return cur.rowcount
+
+    def metrics(self):
+        """
+        Returns:
+            dict: `depth` (visible pending items), `in_flight` (leased items),
+            `dead` (dead letters) and `lag_seconds` (age of the oldest pending item).
+        """
+        now = time.time()
+        conn = self.connect()
+        depth, in_flight, oldest = conn.execute(
+            "SELECT "
+            "SUM(CASE WHEN visible_at <= ? THEN 1 ELSE 0 END), "
+            "SUM(CASE WHEN visible_at > ? THEN 1 ELSE 0 END), "
+            "MIN(enqueued_at) "
+            "FROM email_queue WHERE status = ?",
+            (now, now, PENDING),
+        ).fetchone()
+        dead = conn.execute("SELECT COUNT(*) FROM email_queue WHERE status = ?", (DEAD,)).fetchone()[0]
+        conn.close()
+        return {
+            "depth": depth or 0,
+            "in_flight": in_flight or 0,
+            "dead": dead,
+            "lag_seconds": round(now - oldest, 3) if oldest is not None else 0.0,
+        }
@@ -4,28 +4,67 @@ import agents.intent_classifier as classifier
 import agents.priority_scorer as scorer
 import agents.response_drafter as drafter
 import agents.logger as logger
+from agents.work_queue import WorkQueue
 
-def run_pipeline():
-    logging.info("CrewAI Orchestrator: Starting the customer support pipeline.")
-    
-    # Step 1: Ingest Email
-    email = ingestion.run()
-    
+def process_email(email):
+    """Run the classifier, scorer, drafter and logger agents on one email."""
     # Step 2: Classify Intent
     intent = classifier.run(email)
-    
+
     # Step 3: Score Urgency
     urgency = scorer.run(email)
-    
+
     # Step 4: Draft Response
     response = drafter.run(email, intent)
-    
+
     # Step 5: Log the processed result
     logger.run(email, intent, urgency, response)
-    
+
+def drain_queue(queue=None, batch_size=10, max_batches=None):
+    """
+    Lease batches from the work queue and process them until it is empty.
+    Args:
+        queue (WorkQueue): Queue to drain; defaults to the main database queue.
+        batch_size (int): Number of emails leased per batch.
+        max_batches (int): Optional cap on the number of batches processed.
+    Returns:
+        int: Number of emails processed successfully.
+    """
+    queue = queue or WorkQueue()
+    queue.recover()
+    processed = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        emails = queue.lease(batch_size)
+        if not emails:
+            break
+        batches += 1
+        done = []
+        for email in emails:
+            try:
+                process_email(email)
+                done.append(email["email_id"])
+            except Exception as e:
+                logging.exception("CrewAI Orchestrator: Failed to process email %s.", email["email_id"])
+                queue.fail(email["email_id"], e)
+        queue.ack(done)
+        processed += len(done)
+    logging.info("CrewAI Orchestrator: Queue metrics: %s", queue.metrics())
+    return processed
+
+def run_pipeline():
+    logging.info("CrewAI Orchestrator: Starting the customer support pipeline.")
+
+    # Step 1: Ingest Email (stored and enqueued)
+    email = ingestion.run()
+    if email is None:
+        logging.error("CrewAI Orchestrator: No email ingested, processing any queued backlog.")
+
+    # Steps 2-5: Drain the queue, including emails left over from earlier failed runs
+    drain_queue()
+
     logging.info("CrewAI Orchestrator: Pipeline execution completed.")
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     run_pipeline()
-
@@ -0,0 +1,277 @@
+import os
+import re
+import json
+import time
+import random
+import sqlite3
+import argparse
+import multiprocessing
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timedelta
+
+from EmailGenerator import SupportEmailGenerator
+
+SEED_FILE = os.path.join("data", "mock_support_emails.json")
+SCHEMA_PATH = os.path.join("database", "schema.sql")
+
+DROP_STATEMENT = re.compile(r"DROP TABLE[^;]*;", re.IGNORECASE)
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+SALUTATION = re.compile(r"^(Dear|Hi|Hello) [^,\n]+,")
+SIGNOFF = re.compile(r"^(best|kind regards|warm regards|regards|sincerely|thank you|thanks|cheers)\b", re.IGNORECASE)
+NAME_OR_EMAIL = re.compile(r"@|^[A-Z][a-z]+( [A-Z][a-z]+)*$")
+
+# Emails are seeded in fixed-size blocks so output depends only on the seed,
+# not on the chunk size or the number of processes.
+SEED_BLOCK = 1000
+
+# Set per worker process by init_worker.
+_generator = None
+
+
+class OfflineEmailGenerator(SupportEmailGenerator):
+    """
+    Generate labeled support emails without any API calls.
+
+    Bodies and responses are recombined from the seed corpus at the sentence
+    and paragraph level, always drawing from seeds of the same intent so the
+    labels stay meaningful. Senders reuse the name and domain components of
+    SupportEmailGenerator. All randomness comes from a caller-supplied
+    `random.Random`, so output is fully determined by the seed.
+    """
+
+    def __init__(self, seed_file=SEED_FILE, intent_weights=None, urgency_weights=None,
+                 end_date=datetime(2025, 6, 1), days=425):
+        self.setup_components()
+        self.end_date = end_date
+        self.days = days
+        with open(seed_file, "r") as f:
+            self.load_seeds(json.load(f))
+
+        intents = Counter(e["intent_label"] for e in self.seed_emails)
+        urgencies = Counter(e["urgency_score"] for e in self.seed_emails)
+        self.intent_weights = intent_weights or {i: intents.get(i, 0) or 1 for i in self.intents}
+        self.urgency_weights = urgency_weights or dict(sorted(urgencies.items()))
+        self.validate_weights()
+
+    def validate_weights(self):
+        """Raise ValueError for unknown intents or weights that cannot be sampled from."""
+        unknown = sorted(set(self.intent_weights) - set(self.intents))
+        if unknown:
+            raise ValueError(f"unknown intent(s) {', '.join(unknown)}; expected one of: {', '.join(self.intents)}")
+        for name, weights in (("intent", self.intent_weights), ("urgency", self.urgency_weights)):
+            if any(w < 0 for w in weights.values()) or sum(weights.values()) <= 0:
+                raise ValueError(f"{name} weights must be non-negative with a positive total")
+
+    def load_seeds(self, emails):
+        """Index the seed corpus into per-intent pools of greetings, paragraphs, sentences and sign-offs."""
+        self.seed_emails = emails
+        self.subjects = defaultdict(list)
+        self.openings = defaultdict(list)
+        self.middles = defaultdict(list)
+        self.responses = defaultdict(list)
+        self.greetings = []
+        self.signoffs = []
+        for email in emails:
+            intent = email["intent_label"]
+            self.subjects[intent].append(email["subject"])
+            paragraphs = [p.strip() for p in email["body"].split("\n\n") if p.strip()]
+            if len(paragraphs) >= 3 and len(paragraphs[0]) < 40:
+                self.greetings.append(paragraphs[0])
+                paragraphs = paragraphs[1:]
+                # Strip trailing sign-off and signature paragraphs; keep only genuine
+                # sign-off phrases so seed customers' names and addresses never leak.
+                while len(paragraphs) > 1 and self.is_closing(paragraphs[-1]):
+                    line = paragraphs.pop().split("\n")[0].strip()
+                    if SIGNOFF.match(line) and not NAME_OR_EMAIL.search(line):
+                        self.signoffs.append(line)
+            if paragraphs:
+                self.openings[intent].extend(SENTENCE_SPLIT.split(paragraphs[0]))
+                self.middles[intent].extend(paragraphs[1:])
+            self.responses[intent].append(email["response"])
+        self.greetings = self.greetings or ["Hi there,"]
+        self.signoffs = self.signoffs or ["Best,"]
+
+    @staticmethod
+    def is_closing(paragraph):
+        """True for short closing paragraphs: a sign-off phrase, a name or an email address."""
+        line = paragraph.split("\n")[0].strip()
+        return len(line) < 40 and bool(SIGNOFF.match(line) or NAME_OR_EMAIL.search(line))
+
+    def pool(self, pools, intent):
+        """Return the pool for `intent`, falling back to all seeds for unseen intents."""
+        if pools.get(intent):
+            return pools[intent]
+        return [item for items in pools.values() for item in items]
+
+    def generate_body(self, rng, intent, first_name):
+        openings = self.pool(self.openings, intent)
+        sentences = rng.sample(openings, min(len(openings), rng.randint(2, 4)))
+        paragraphs = [rng.choice(self.greetings), " ".join(sentences)]
+        middles = self.pool(self.middles, intent)
+        if middles:
+            paragraphs.append(rng.choice(middles))
+        paragraphs.append(rng.choice(self.signoffs) + "\n" + first_name)
+        return "\n\n".join(paragraphs)
+
+    def generate_response(self, rng, intent, first_name):
+        response = rng.choice(self.pool(self.responses, intent))
+        return SALUTATION.sub(lambda m: f"{m.group(1)} {first_name},", response)
+
+    def generate_offline_email(self, rng, email_id):
+        """
+        Generate one labeled email.
+        Args:
+            rng (random.Random): Source of randomness.
+            email_id (int): ID to assign.
+        Returns:
+            dict: Email with the same fields as mock_support_emails.json.
+        """
+        intent = rng.choices(list(self.intent_weights), weights=list(self.intent_weights.values()))[0]
+        urgency = rng.choices(list(self.urgency_weights), weights=list(self.urgency_weights.values()))[0]
+        first_name = rng.choice(self.first_names)
+        last_name = rng.choice(self.last_names)
+        domain = rng.choice(self.domains)
+        sender = rng.choice([
+            f"{first_name}.{last_name}@{domain}",
+            f"{first_name}{last_name}@{domain}",
+            f"{first_name}{rng.randint(1, 99)}@{domain}",
+            f"{first_name[0]}{last_name}@{domain}",
+            f"{last_name}.{first_name}@{domain}",
+        ]).lower()
+        timestamp = (self.end_date - timedelta(days=rng.randint(0, self.days))).strftime("%m/%d/%Y")
+        return {
+            "email_id": email_id,
+            "timestamp": timestamp,
+            "sender": sender,
+            "subject": rng.choice(self.pool(self.subjects, intent)),
+            "body": self.generate_body(rng, intent, first_name),
+            "intent_label": intent,
+            "urgency_score": urgency,
+            "response": self.generate_response(rng, intent, first_name),
+        }
+
+
+def init_worker(generator):
+    global _generator
+    _generator = generator
+
+
+def generate_chunk(task):
+    """
+    Generate one chunk of emails inside a worker.
+    Args:
+        task (tuple): (seed, offset, start_id, count), with `offset` a multiple of SEED_BLOCK.
+    Returns:
+        list: Email dicts.
+    """
+    seed, offset, start_id, count = task
+    emails = []
+    for i in range(offset, offset + count):
+        if i % SEED_BLOCK == 0:
+            rng = random.Random(seed * 1_000_003 + i // SEED_BLOCK)
+        emails.append(_generator.generate_offline_email(rng, start_id + i))
+    return emails
+
+
+def iter_chunks(generator, count, seed=42, start_id=1, chunk_size=10_000, processes=None):
+    """
+    Yield generated chunks in order, produced across `processes` worker processes.
+
+    At most 2 x `processes` chunks are in flight at once, so memory stays
+    bounded when the writer is slower than the generators.
+    """
+    processes = processes or os.cpu_count() or 1
+    chunk_size = max(chunk_size // SEED_BLOCK, 1) * SEED_BLOCK
+    tasks = (
+        (seed, offset, start_id, min(chunk_size, count - offset))
+        for offset in range(0, count, chunk_size)
+    )
+    with multiprocessing.Pool(processes, initializer=init_worker, initargs=(generator,)) as pool:
+        window = deque()
+        for task in tasks:
+            window.append(pool.apply_async(generate_chunk, (task,)))
+            if len(window) >= 2 * processes:
+                yield window.popleft().get()
+        while window:
+            yield window.popleft().get()
+
+
+def write_ndjson(chunks, output_file):
+    written = 0
+    with open(output_file, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            f.write("".join(json.dumps(email) + "\n" for email in chunk))
+            written += len(chunk)
+    return written
+
+
+def write_sqlite(chunks, db_path, reset=False):
+    with open(SCHEMA_PATH, "r") as f:
+        schema = f.read()
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    # Without --reset only create the table if it is missing; never drop existing rows.
+    conn.executescript(schema if reset else DROP_STATEMENT.sub("", schema))
+    written = 0
+    for chunk in chunks:
+        conn.executemany(
+            "INSERT INTO support_emails (email_id, timestamp, sender, subject, body, intent_label, urgency_score, response) "
+            "VALUES (:email_id, :timestamp, :sender, :subject, :body, :intent_label, :urgency_score, :response)",
+            chunk,
+        )
+        conn.commit()
+        written += len(chunk)
+    conn.close()
+    return written
+
+
+def parse_weights(spec, cast=str):
+    """Parse 'key=weight,key=weight' into a dict, e.g. 'Complaint=3,Billing Issue=1'."""
+    if not spec:
+        return None
+    weights = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            raise ValueError(f"expected key=weight, got '{item}'")
+        key, value = item.rsplit("=", 1)
+        weights[cast(key.strip())] = float(value)
+    return weights
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate labeled support emails offline from the seed corpus.")
+    parser.add_argument("--count", type=int, default=10_000, help="Number of emails to generate")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; same seed gives identical output")
+    parser.add_argument("--ndjson", help="Write JSON Lines to this file")
+    parser.add_argument("--sqlite", help="Insert into the support_emails table of this database")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate support_emails before inserting into --sqlite")
+    parser.add_argument("--start_id", type=int, default=1, help="First email_id to assign")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk_size", type=int, default=10_000, help="Emails generated per worker task")
+    parser.add_argument("--intent_weights", help="e.g. 'Complaint=3,Billing Issue=1' (default: seed frequencies)")
+    parser.add_argument("--urgency_weights", help="e.g. '0=1,1=1,2=2,3=1' (default: seed frequencies)")
+    args = parser.parse_args()
+
+    if not args.ndjson and not args.sqlite:
+        parser.error("one of --ndjson or --sqlite is required")
+
+    try:
+        generator = OfflineEmailGenerator(
+            intent_weights=parse_weights(args.intent_weights),
+            urgency_weights=parse_weights(args.urgency_weights, cast=int),
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    chunks = iter_chunks(generator, args.count, seed=args.seed, start_id=args.start_id,
+                         chunk_size=args.chunk_size, processes=args.processes)
+
+    start_time = time.time()
+    if args.ndjson:
+        written = write_ndjson(chunks, args.ndjson)
+        target = args.ndjson
+    else:
+        written = write_sqlite(chunks, args.sqlite, reset=args.reset)
+        target = args.sqlite
+    total_time = time.time() - start_time
+    print(f"Generated {written} emails in {total_time:.2f} seconds ({written / max(total_time, 1e-9):.0f} emails/sec)")
+    print(f"Output saved to: {target}")
@@ -0,0 +1,13 @@
+-- database/queue_schema.sql
+-- Durable work queue between ingestion and the processing agents (applied by agents/work_queue.py)
+CREATE TABLE IF NOT EXISTS email_queue (
+    email_id INTEGER PRIMARY KEY,
+    enqueued_at REAL NOT NULL,
+    visible_at REAL NOT NULL,
+    lease_owner TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    last_error TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_email_queue_visible ON email_queue (status, visible_at);
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# export_snapshots.py
+import os
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import subprocess
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+DB_PATH = os.path.join('database', 'support_emails.db')
+SNAPSHOT_DIR = os.path.join('snapshots', 'support_emails')
+MANIFEST = '_manifest.json'
+
+COLUMNS = ['email_id', 'timestamp', 'sender', 'subject', 'body', 'intent_label', 'urgency_score', 'response']
+SCHEMA = pa.schema([
+    ('email_id', pa.int64()),
+    ('timestamp', pa.string()),
+    ('sender', pa.string()),
+    ('subject', pa.string()),
+    ('body', pa.string()),
+    ('intent_label', pa.string()),
+    ('urgency_score', pa.int64()),
+    ('response', pa.string()),
+])
+EXTENSIONS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+def read_manifest(snapshot_dir):
+    path = os.path.join(snapshot_dir, MANIFEST)
+    if not os.path.exists(path):
+        return {'last_email_id': 0, 'pending_ids': [], 'partitions': []}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def write_manifest(snapshot_dir, manifest):
+    # Write then rename so readers never see a half-written manifest.
+    path = os.path.join(snapshot_dir, MANIFEST)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+def write_partition(table, path, fmt):
+    tmp = path + '.tmp'
+    if fmt == 'parquet':
+        pq.write_table(table, tmp, compression='zstd')
+    else:
+        # Uncompressed Arrow IPC can be memory-mapped without copying.
+        feather.write_feather(table, tmp, compression='uncompressed')
+    os.replace(tmp, path)
+
+def export(db_path=DB_PATH, snapshot_dir=SNAPSHOT_DIR, partition_rows=100_000, fmt='parquet'):
+    """
+    Append newly processed `support_emails` rows to the snapshot as email_id-range partitions.
+
+    Only processed rows (non-NULL `intent_label`) are exported. Unprocessed
+    rows at or below the high-water mark are remembered in the manifest as
+    `pending_ids` and exported by a later run once they are labeled, so an
+    email stuck in the dead-letter list never blocks the rows after it.
+    Returns:
+        int: Number of rows exported.
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    manifest = read_manifest(snapshot_dir)
+    last_id = manifest['last_email_id']
+    pending = manifest.get('pending_ids', [])
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TEMP TABLE pending_ids (email_id INTEGER PRIMARY KEY)")
+    conn.executemany("INSERT INTO temp.pending_ids VALUES (?)", ((i,) for i in pending))
+    conn.commit()
+    # One read transaction so the pending set and the exported rows see the same data.
+    conn.execute("BEGIN")
+    high_id = conn.execute("SELECT MAX(email_id) FROM support_emails").fetchone()[0] or last_id
+    candidates = "(email_id > ? AND email_id <= ?) OR email_id IN (SELECT email_id FROM temp.pending_ids)"
+    still_pending = [row[0] for row in conn.execute(
+        f"SELECT email_id FROM support_emails WHERE ({candidates}) AND intent_label IS NULL ORDER BY email_id",
+        (last_id, high_id),
+    )]
+    cur = conn.execute(
+        f"SELECT {', '.join(COLUMNS)} FROM support_emails "
+        f"WHERE ({candidates}) AND intent_label IS NOT NULL ORDER BY email_id",
+        (last_id, high_id),
+    )
+
+    exported = 0
+    new_partitions = []
+    run = max((p.get('run', 0) for p in manifest['partitions']), default=0) + 1
+    while True:
+        rows = cur.fetchmany(partition_rows)
+        if not rows:
+            break
+        table = pa.Table.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(zip(*rows), SCHEMA)],
+            schema=SCHEMA,
+        )
+        start_id, end_id = rows[0][0], rows[-1][0]
+        # The run number keeps names unique when late rows fall inside an earlier range.
+        name = f"part-{run:06d}-{start_id:010d}-{end_id:010d}{EXTENSIONS[fmt]}"
+        write_partition(table, os.path.join(snapshot_dir, name), fmt)
+        new_partitions.append({'file': name, 'run': run, 'start_id': start_id, 'end_id': end_id, 'rows': len(rows)})
+        exported += len(rows)
+        logging.info(f"Exported {len(rows)} rows to {name}.")
+    conn.rollback()
+    conn.close()
+
+    # Partitions are only published by the manifest, so a crash mid-run exports nothing twice.
+    manifest['partitions'].extend(new_partitions)
+    manifest['last_email_id'] = high_id
+    manifest['pending_ids'] = still_pending
+    write_manifest(snapshot_dir, manifest)
+
+    logging.info(f"Exported {exported} new rows; snapshot covers email_id <= {high_id} "
+                 f"except {len(still_pending)} unprocessed email(s).")
+    return exported
+
+def load_snapshots(snapshot_dir=SNAPSHOT_DIR, columns=None):
+    """
+    Load the snapshot into a pandas DataFrame.
+    Args:
+        snapshot_dir (str): Directory written by `export`.
+        columns (list): Columns to read; others are never decoded.
+    Returns:
+        pandas.DataFrame: Concatenated partitions in export order.
+    """
+    manifest = read_manifest(snapshot_dir)
+    tables = []
+    for partition in manifest['partitions']:
+        path = os.path.join(snapshot_dir, partition['file'])
+        if path.endswith('.parquet'):
+            tables.append(pq.read_table(path, columns=columns, memory_map=True))
+        else:
+            tables.append(feather.read_table(path, columns=columns, memory_map=True))
+    if not tables:
+        return pa.schema([f for f in SCHEMA if columns is None or f.name in columns]).empty_table().to_pandas()
+    return pa.concat_tables(tables).to_pandas()
+
+def measure(method, db_path, snapshot_dir):
+    """
+    Load training columns with one method in a fresh interpreter.
+
+    pyarrow and train_model (pandas, scikit-learn) are imported before the
+    baseline is taken, so both methods pay the same import cost and the
+    reported RSS is only what the load itself added to the peak.
+    """
+    import resource
+    import train_model
+    # The snapshot path imports this module by name; load it up front for both methods.
+    import export_snapshots  # noqa: F401
+
+    # ru_maxrss is reported in kilobytes on Linux.
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if method == 'sql':
+        df = train_model.load_data(db_path)
+    else:
+        df = train_model.load_data(db_path, snapshot_dir=snapshot_dir)
+    elapsed = time.perf_counter() - start
+    load_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_kb) / 1024
+    print(json.dumps({'method': method, 'rows': len(df), 'seconds': elapsed, 'load_rss_mb': load_mb}))
+
+def benchmark(db_path, snapshot_dir):
+    # Bring the snapshot up to date so both paths load the same processed rows.
+    export(db_path, snapshot_dir)
+    print(f"{'method':>10} {'rows':>10} {'seconds':>10} {'load RSS MB':>12}")
+    rows = []
+    for method in ('sql', 'snapshot'):
+        out = subprocess.run(
+            [sys.executable, __file__, '--db_path', db_path, '--snapshot_dir', snapshot_dir, '--measure', method],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(out)
+        rows.append(result['rows'])
+        print(f"{method:>10} {result['rows']:>10} {result['seconds']:>10.2f} {result['load_rss_mb']:>12.1f}")
+    if rows[0] != rows[1]:
+        logging.warning(f"Row counts differ ({rows[0]} vs {rows[1]}); rows changed during the benchmark.")
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Export support_emails to incremental columnar snapshots.")
+    parser.add_argument('--db_path', default=DB_PATH, help='SQLite database to export')
+    parser.add_argument('--snapshot_dir', default=SNAPSHOT_DIR, help='Directory holding the snapshot partitions')
+    parser.add_argument('--partition_rows', type=int, default=100_000, help='Maximum rows per partition file')
+    parser.add_argument('--format', choices=sorted(EXTENSIONS), default='parquet', help='Partition file format')
+    parser.add_argument('--benchmark', action='store_true', help='Compare load time and memory of SQL vs snapshot')
+    parser.add_argument('--measure', choices=['sql', 'snapshot'], help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+    if args.measure:
+        logging.getLogger().setLevel(logging.WARNING)
+        measure(args.measure, args.db_path, args.snapshot_dir)
+    elif args.benchmark:
+        benchmark(args.db_path, args.snapshot_dir)
+    else:
+        export(args.db_path, args.snapshot_dir, args.partition_rows, args.format)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# parallel_pipeline.py
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import logging
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+DB_PATH = os.path.join('database', 'support_emails.db')
+DATA_JSON = os.path.join('data', 'mock_support_emails.json')
+SCHEMA_PATH = os.path.join('database', 'schema.sql')
+
+# Set per worker process by init_worker.
+_db_path = None
+
+def init_worker(db_path):
+    """
+    Process pool initializer: load the model once per worker.
+
+    With the `fork` start method the parent has already imported the
+    classifier, so workers share the model's read-only arrays copy-on-write
+    instead of each unpickling their own copy.
+    """
+    global _db_path
+    _db_path = db_path
+    import agents.intent_classifier
+    # Shadow comparisons belong to the database being processed, not the production one.
+    agents.intent_classifier.configure_shadow(db_path)
+    # Per-email agent logging would dominate the runtime of a bulk backlog.
+    logging.getLogger().setLevel(logging.WARNING)
+
+def process_shard(start_id, end_id, batch_size):
+    """
+    Process the unprocessed emails with `start_id <= email_id <= end_id`.
+    Runs inside a worker; the database is only read here.
+    Returns:
+        list: (intent_label, urgency_score, response, email_id) tuples for the writer.
+    """
+    import agents.intent_classifier as classifier
+    import agents.priority_scorer as scorer
+    import agents.response_drafter as drafter
+
+    conn = sqlite3.connect(_db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    cur = conn.execute(
+        "SELECT email_id, timestamp, sender, subject, body FROM support_emails "
+        "WHERE email_id BETWEEN ? AND ? AND intent_label IS NULL ORDER BY email_id",
+        (start_id, end_id),
+    )
+    results = []
+    while True:
+        emails = [dict(row) for row in cur.fetchmany(batch_size)]
+        if not emails:
+            break
+        intents = classifier.run_batch(emails)
+        for email, intent in zip(emails, intents):
+            intent = str(intent)
+            urgency = scorer.score(email.get("body", ""))
+            response = drafter.run(email, intent)
+            results.append((intent, urgency, response, email["email_id"]))
+    conn.close()
+    # Shadow rows are written by a background thread; finish them before the worker can exit.
+    classifier.shadow.flush()
+    return results
+
+def make_shards(conn, shard_count):
+    """Split the id range of unprocessed emails into `shard_count` contiguous ranges."""
+    low, high = conn.execute(
+        "SELECT MIN(email_id), MAX(email_id) FROM support_emails WHERE intent_label IS NULL"
+    ).fetchone()
+    if low is None:
+        return []
+    step = max((high - low + 1) // shard_count, 1)
+    shards = []
+    start = low
+    while start <= high:
+        end = min(start + step - 1, high)
+        shards.append((start, end))
+        start = end + 1
+    return shards
+
+def write_results(conn, results):
+    """Single-writer step: persist one shard's results and ack them in the work queue."""
+    conn.executemany(
+        "UPDATE support_emails SET intent_label = ?, urgency_score = ?, response = ? WHERE email_id = ?",
+        results,
+    )
+    has_queue = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'email_queue'"
+    ).fetchone()
+    if has_queue:
+        conn.executemany("DELETE FROM email_queue WHERE email_id = ?", [(r[3],) for r in results])
+    conn.commit()
+
+def run_parallel(db_path=DB_PATH, workers=None, batch_size=256, shards_per_worker=4):
+    """
+    Process the backlog of unprocessed `support_emails` rows across a process pool.
+
+    Rows are sharded by `email_id` range; workers classify, score and draft in
+    batches and return their results to this process, which is the only one
+    writing to the database. The HTML frontend is not updated for bulk runs.
+    Returns:
+        int: Number of emails processed.
+    """
+    workers = workers or os.cpu_count() or 1
+    import agents.intent_classifier  # noqa: F401  (load before forking so workers share it)
+
+    conn = sqlite3.connect(db_path, timeout=30)
+    shards = make_shards(conn, workers * shards_per_worker)
+    logging.info("Parallel Pipeline: %d shard(s) across %d worker(s).", len(shards), workers)
+
+    processed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(db_path,)) as executor:
+        futures = [executor.submit(process_shard, start, end, batch_size) for start, end in shards]
+        for future in as_completed(futures):
+            results = future.result()
+            write_results(conn, results)
+            processed += len(results)
+    conn.close()
+    logging.info("Parallel Pipeline: Processed %d email(s).", processed)
+    return processed
+
+def build_synthetic_db(db_path, rows, seed=42):
+    """Create a database with `rows` unprocessed emails sampled from the mock corpus."""
+    with open(DATA_JSON, 'r') as f:
+        corpus = json.load(f)
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    with open(SCHEMA_PATH, 'r') as f:
+        conn.executescript(f.read())
+    conn.executemany(
+        "INSERT INTO support_emails (email_id, timestamp, sender, subject, body) VALUES (?, ?, ?, ?, ?)",
+        (
+            (i, e["timestamp"], e["sender"], e["subject"], e["body"])
+            for i, e in ((i, rng.choice(corpus)) for i in range(1, rows + 1))
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+def benchmark(rows, worker_counts, batch_size):
+    """Time run_parallel on a fresh synthetic table for each worker count."""
+    baseline = None
+    print(f"{'workers':>8} {'seconds':>10} {'emails/s':>10} {'speedup':>8}")
+    for workers in worker_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'bench.db')
+            build_synthetic_db(db_path, rows)
+            start = time.perf_counter()
+            run_parallel(db_path, workers=workers, batch_size=batch_size)
+            elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>10.2f} {rows / elapsed:>10.0f} {baseline / elapsed:>7.2f}x")
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+    if sys.platform.startswith('linux'):
+        multiprocessing.set_start_method('fork')
+
+    parser = argparse.ArgumentParser(description="Process the backlog of unprocessed emails across multiple processes.")
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--batch_size', type=int, default=256, help='Emails per vectorized model call')
+    parser.add_argument('--benchmark', action='store_true', help='Benchmark scaling on a synthetic table instead')
+    parser.add_argument('--rows', type=int, default=100_000, help='Synthetic table size for --benchmark')
+    parser.add_argument('--worker_counts', type=int, nargs='+', default=[1, 2, 4, 8], help='Worker counts for --benchmark')
+
+    args = parser.parse_args()
+    if args.benchmark:
+        logging.getLogger().setLevel(logging.WARNING)
+        benchmark(args.rows, args.worker_counts, args.batch_size)
+    else:
+        run_parallel(workers=args.workers, batch_size=args.batch_size)
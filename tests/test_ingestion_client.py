@@ -0,0 +1,195 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from agents.ingestion_client import (
+    AsyncIngestionClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    IngestionClient,
+    IngestionError,
+)
+
+FAST = {"backoff_base": 0.001, "backoff_cap": 0.01, "timeout": 5}
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local stand-in for the `/new_email` API that replays scripted status codes."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.statuses = []
+        self.requests = 0
+        self.served = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            status = server.statuses.pop(0) if server.statuses else 200
+            if status == 200:
+                server.served += 1
+                email_id = server.served
+        if self.path != "/new_email":
+            status = 404
+        body = b"{}"
+        if status == 200:
+            body = json.dumps({
+                "email_id": email_id,
+                "timestamp": "01/01/2025",
+                "sender": "test@example.com",
+                "subject": f"Subject {email_id}",
+                "body": "Body",
+            }).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = StandInServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_sync_retries_on_503(server):
+    server.statuses = [503, 503]
+    with IngestionClient(server.base_url, **FAST) as client:
+        email = client.fetch_email()
+    assert email["email_id"] == 1
+    assert server.requests == 3
+
+
+def test_async_retries_on_503(server):
+    server.statuses = [503, 503]
+
+    async def fetch():
+        async with AsyncIngestionClient(server.base_url, **FAST) as client:
+            return await client.fetch_email()
+
+    assert asyncio.run(fetch())["email_id"] == 1
+    assert server.requests == 3
+
+
+def test_sync_breaker_fails_fast_after_exhausted_calls(server):
+    server.statuses = [503] * 100
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    with IngestionClient(server.base_url, max_retries=2, breaker=breaker, **FAST) as client:
+        for _ in range(2):
+            with pytest.raises(IngestionError) as excinfo:
+                client.fetch_email()
+            assert not isinstance(excinfo.value, CircuitOpenError)
+        # Every retry ran: 2 calls x 3 attempts.
+        assert server.requests == 6
+        with pytest.raises(CircuitOpenError):
+            client.fetch_email()
+    assert server.requests == 6
+
+
+def test_async_breaker_fails_fast_after_exhausted_calls(server):
+    server.statuses = [503] * 100
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    async def scenario():
+        async with AsyncIngestionClient(server.base_url, max_retries=2, breaker=breaker, **FAST) as client:
+            for _ in range(2):
+                with pytest.raises(IngestionError) as excinfo:
+                    await client.fetch_email()
+                assert not isinstance(excinfo.value, CircuitOpenError)
+            with pytest.raises(CircuitOpenError):
+                await client.fetch_email()
+
+    asyncio.run(scenario())
+    assert server.requests == 6
+
+
+def test_cold_start_batch_does_not_trip_breaker(server):
+    # Five failing first attempts across threads must not open a threshold-5 breaker.
+    server.statuses = [503] * 5
+    with IngestionClient(server.base_url, **FAST) as client:
+        emails = client.fetch_batch(10)
+        assert len(emails) == 10
+        assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_admits_single_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    time.sleep(0.06)
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_sync_iter_emails_prefetches_in_order(server):
+    with IngestionClient(server.base_url, **FAST) as client:
+        emails = client.iter_emails(6, prefetch=2)
+        first = next(emails)
+        # One consumed, two buffered, one more fetched and waiting for buffer space.
+        assert wait_for(lambda: server.requests == 4)
+        time.sleep(0.05)
+        assert server.requests == 4
+        ids = [first["email_id"]] + [email["email_id"] for email in emails]
+    assert ids == [1, 2, 3, 4, 5, 6]
+
+
+def test_async_iter_emails_prefetches_in_order(server):
+    async def scenario():
+        async with AsyncIngestionClient(server.base_url, **FAST) as client:
+            ids = []
+            async for email in client.iter_emails(6, prefetch=2):
+                if not ids:
+                    for _ in range(50):
+                        if server.requests >= 3:
+                            break
+                        await asyncio.sleep(0.01)
+                    assert server.requests >= 3
+                ids.append(email["email_id"])
+            return ids
+
+    assert asyncio.run(scenario()) == [1, 2, 3, 4, 5, 6]
+
+
+def test_iter_emails_raises_after_retries_exhausted(server):
+    server.statuses = [200] + [503] * 100
+    with IngestionClient(server.base_url, max_retries=1, **FAST) as client:
+        emails = client.iter_emails(3, prefetch=2)
+        assert next(emails)["email_id"] == 1
+        with pytest.raises(IngestionError):
+            next(emails)
@@ -0,0 +1,90 @@
+import pickle
+import time
+
+import pytest
+
+from agents.model_registry import ACTIVE, CANDIDATE, ModelRegistry, ServedModel, ShadowRecorder, shadow_report
+
+
+class ConstantModel:
+    """Picklable stand-in for a fitted pipeline that predicts one label."""
+
+    def __init__(self, label):
+        self.label = label
+
+    def predict(self, texts):
+        return [self.label for _ in texts]
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(str(tmp_path / "registry"))
+
+
+def test_bootstrap_adopts_legacy_file(registry, tmp_path):
+    legacy = tmp_path / "intent_classifier.pkl"
+    legacy.write_bytes(pickle.dumps(ConstantModel("Complaint")))
+    version = registry.bootstrap(str(legacy))
+    assert registry.pointer(ACTIVE) == version
+    assert registry.metadata(version)["bootstrapped"] is True
+    # A second bootstrap keeps the active version.
+    assert registry.bootstrap(str(legacy)) == version
+
+
+def test_register_is_content_addressed(registry):
+    assert registry.register(ConstantModel("A")) == registry.register(ConstantModel("A"))
+    assert registry.register(ConstantModel("A")) != registry.register(ConstantModel("B"))
+
+
+def test_served_model_picks_up_promotion_after_check_interval(registry):
+    old = registry.register(ConstantModel("old"))
+    new = registry.register(ConstantModel("new"))
+    registry.promote(old)
+    served = ServedModel(registry, check_interval=0.2)
+    assert served.get()[0][0] == old
+
+    registry.promote(new)
+    (version, model), _ = served.get()
+    assert version == old
+    assert model.predict(["x"]) == ["old"]
+
+    time.sleep(0.25)
+    (version, model), _ = served.get()
+    assert version == new
+    assert model.predict(["x"]) == ["new"]
+
+
+def test_served_model_loads_and_clears_candidate(registry):
+    active = registry.register(ConstantModel("A"))
+    candidate = registry.register(ConstantModel("B"))
+    registry.promote(active)
+    registry.set_pointer(CANDIDATE, candidate)
+    served = ServedModel(registry, check_interval=0)
+    assert served.get()[1][0] == candidate
+
+    registry.promote(candidate)
+    (version, _), (candidate_version, candidate_model) = served.get()
+    assert version == candidate
+    assert (candidate_version, candidate_model) == (None, None)
+
+
+def test_unknown_version_cannot_be_promoted(registry):
+    with pytest.raises(ValueError):
+        registry.promote("does-not-exist")
+
+
+def test_shadow_report_reflects_submitted_comparisons(tmp_path):
+    db_path = str(tmp_path / "shadow.db")
+    recorder = ShadowRecorder(db_path)
+    recorder.submit("v1", ["A", "A", "B"], 1.0, "v2", ConstantModel("A"), ["x", "y", "z"])
+    recorder.submit("v1", ["A"], 1.0, "v2", ConstantModel("A"), ["w"])
+    recorder.submit("v1", ["B"], 1.0, "v3", ConstantModel("A"), ["v"])
+    recorder.flush()
+
+    report = {row["candidate_version"]: row for row in shadow_report(db_path)}
+    assert report["v2"]["active_version"] == "v1"
+    assert report["v2"]["samples"] == 4
+    assert report["v2"]["agreement_rate"] == 0.75
+    assert report["v3"]["samples"] == 1
+    assert report["v3"]["agreement_rate"] == 0.0
+    assert [row["candidate_version"] for row in shadow_report(db_path, candidate_version="v3")] == ["v3"]
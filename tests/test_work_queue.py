@@ -0,0 +1,130 @@
+import os
+import sqlite3
+import time
+
+import pytest
+
+from agents.work_queue import WorkQueue
+
+SCHEMA_PATH = os.path.join("database", "schema.sql")
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "support_emails.db")
+    conn = sqlite3.connect(path)
+    with open(SCHEMA_PATH, "r") as f:
+        conn.executescript(f.read())
+    conn.executemany(
+        "INSERT INTO support_emails (email_id, subject, body) VALUES (?, ?, ?)",
+        [(i, f"Subject {i}", "Body") for i in range(1, 6)],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def leased_ids(queue, batch_size=10):
+    return [email["email_id"] for email in queue.lease(batch_size)]
+
+
+def test_lease_hides_items_until_visibility_timeout(db_path):
+    queue = WorkQueue(db_path, visibility_timeout=0.2)
+    queue.enqueue(1)
+    queue.enqueue(2)
+    assert leased_ids(queue) == [1, 2]
+    assert leased_ids(queue) == []
+    assert queue.metrics()["in_flight"] == 2
+    time.sleep(0.25)
+    assert leased_ids(queue) == [1, 2]
+
+
+def test_lease_returns_email_rows(db_path):
+    queue = WorkQueue(db_path)
+    queue.enqueue(3)
+    (email,) = queue.lease()
+    assert email["email_id"] == 3
+    assert email["subject"] == "Subject 3"
+
+
+def test_ack_removes_items(db_path):
+    queue = WorkQueue(db_path, visibility_timeout=0.05)
+    queue.enqueue(1)
+    queue.enqueue(2)
+    queue.lease()
+    queue.ack([1])
+    time.sleep(0.1)
+    assert leased_ids(queue) == [2]
+    queue.ack([2])
+    assert queue.metrics() == {"depth": 0, "in_flight": 0, "dead": 0, "lag_seconds": 0.0}
+
+
+def test_max_attempts_moves_item_to_dead_letters(db_path):
+    queue = WorkQueue(db_path, visibility_timeout=0.05, max_attempts=2)
+    queue.enqueue(1)
+    assert leased_ids(queue) == [1]
+    queue.fail(1, "first failure")
+    time.sleep(0.1)
+    assert leased_ids(queue) == [1]
+    queue.fail(1, "second failure")
+    time.sleep(0.1)
+    assert leased_ids(queue) == []
+    assert queue.dead_letters() == [(1, 2, "second failure")]
+    assert queue.metrics()["dead"] == 1
+
+
+def test_expired_lease_past_max_attempts_is_dead_lettered(db_path):
+    queue = WorkQueue(db_path, visibility_timeout=0.05, max_attempts=1)
+    queue.enqueue(1)
+    assert leased_ids(queue) == [1]
+    # Worker crashed without calling fail() or ack().
+    time.sleep(0.1)
+    assert leased_ids(queue) == []
+    assert [row[0] for row in queue.dead_letters()] == [1]
+
+
+def test_requeue_dead(db_path):
+    queue = WorkQueue(db_path, max_attempts=1)
+    queue.enqueue(1)
+    queue.lease()
+    queue.fail(1, "boom")
+    assert queue.requeue_dead() == 1
+    assert leased_ids(queue) == [1]
+
+
+def test_recover_enqueues_unprocessed_rows_but_not_dead_ones(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE support_emails SET intent_label = 'Billing Issue' WHERE email_id IN (4, 5)")
+    conn.commit()
+    conn.close()
+
+    queue = WorkQueue(db_path, max_attempts=1)
+    queue.enqueue(1)
+    queue.lease()
+    queue.fail(1, "poison")
+
+    assert queue.recover() == 2
+    assert leased_ids(queue) == [2, 3]
+    assert [row[0] for row in queue.dead_letters()] == [1]
+    assert queue.recover() == 0
+
+
+def test_two_queues_never_lease_the_same_id(db_path):
+    first = WorkQueue(db_path)
+    second = WorkQueue(db_path)
+    for email_id in range(1, 6):
+        first.enqueue(email_id)
+    a = leased_ids(first, batch_size=3)
+    b = leased_ids(second, batch_size=3)
+    assert a == [1, 2, 3]
+    assert b == [4, 5]
+    assert not set(a) & set(b)
+
+
+def test_metrics_report_lag(db_path):
+    queue = WorkQueue(db_path)
+    queue.enqueue(1)
+    time.sleep(0.05)
+    metrics = queue.metrics()
+    assert metrics["depth"] == 1
+    assert metrics["lag_seconds"] >= 0.05
@@ -5,11 +5,13 @@ import pandas as pd
 import argparse
 import logging
 import pickle
+import time
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
-from sklearn.metrics import classification_report
+from sklearn.metrics import classification_report, accuracy_score, f1_score
+from agents.model_registry import ModelRegistry, CANDIDATE
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -18,10 +20,20 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 DB_PATH = os.path.join('database', 'support_emails.db')
 MODEL_PATH = os.path.join('models', 'intent_classifier.pkl')
 
-def load_data(db_path):
-    """Load email data from the SQLite database."""
+def load_data(db_path, snapshot_dir=None):
+    """
+    Load email data from the SQLite database, or from columnar snapshots
+    written by export_snapshots.py when `snapshot_dir` is given.
+    """
+    if snapshot_dir:
+        from export_snapshots import load_snapshots
+        df = load_snapshots(snapshot_dir, columns=['subject', 'body', 'intent_label'])
+        logging.info(f"Loaded {len(df)} emails from snapshots in {snapshot_dir}.")
+        return df
+
     conn = sqlite3.connect(db_path)
-    query = "SELECT subject, body, intent_label FROM support_emails"
+    # Unprocessed rows have no label to train on; snapshots exclude them too.
+    query = "SELECT subject, body, intent_label FROM support_emails WHERE intent_label IS NOT NULL"
     df = pd.read_sql_query(query, conn)
     conn.close()
     logging.info(f"Loaded {len(df)} emails from database.")
@@ -30,7 +42,8 @@ def load_data(db_path):
 def train_model(df, test_size=0.2, random_state=42):
     """
     Train a classifier using the email 'subject' and 'body' as input.
-    Returns a pipeline that includes TF-IDF vectorization and Logistic Regression.
+    Returns a pipeline that includes TF-IDF vectorization and Logistic Regression,
+    and a dict of evaluation metrics for the model registry.
     """
     # Combine subject and body, normalize text by lowercasing
     df['text'] = (df['subject'] + " " + df['body']).str.lower()
@@ -52,33 +65,67 @@ def train_model(df, test_size=0.2, random_state=42):
     logging.info("Model training completed.")
     
     # Evaluate model performance
+    start = time.perf_counter()
     y_pred = pipeline.predict(X_test)
+    latency_ms = (time.perf_counter() - start) * 1000 / max(len(X_test), 1)
     report = classification_report(y_test, y_pred)
     logging.info("Classification Report:\n" + report)
-    
-    return pipeline
+
+    metrics = {
+        'training_rows': len(X_train),
+        'test_rows': len(X_test),
+        'accuracy': round(accuracy_score(y_test, y_pred), 4),
+        'macro_f1': round(f1_score(y_test, y_pred, average='macro'), 4),
+        'inference_ms_per_email': round(latency_ms, 4),
+    }
+    return pipeline, metrics
 
 def save_model(model, model_path):
-    """Save the trained model as a pickle file."""
+    """Save the trained model as a pickle file, replacing any existing file atomically."""
     os.makedirs(os.path.dirname(model_path), exist_ok=True)
-    with open(model_path, 'wb') as f:
+    tmp_path = model_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
         pickle.dump(model, f)
+    os.replace(tmp_path, model_path)
     logging.info(f"Model saved to {model_path}")
 
 def main(args):
-    df = load_data(DB_PATH)
+    df = load_data(DB_PATH, snapshot_dir=args.snapshot_dir)
     
     if df.empty:
         logging.error("No data found in the database. Please run the ingestion script first.")
         return
     
-    model = train_model(df, test_size=args.test_size, random_state=args.random_state)
-    save_model(model, MODEL_PATH)
+    model, metrics = train_model(df, test_size=args.test_size, random_state=args.random_state)
+
+    # Register the new version; serving processes pick it up once promoted or shadowed.
+    registry = ModelRegistry()
+    # Adopt the currently served model file as the first ACTIVE version, so a
+    # shadowed candidate is compared against it rather than served in its place.
+    active = registry.bootstrap(MODEL_PATH)
+    version = registry.register(model, {
+        'source': args.snapshot_dir or DB_PATH,
+        'test_size': args.test_size,
+        'random_state': args.random_state,
+        **metrics,
+    })
+    if args.promote or active is None:
+        # With nothing served yet (fresh checkout) the first model is promoted directly.
+        registry.promote(version)
+        # Keep the legacy file in step with the active version for older deployments.
+        save_model(model, MODEL_PATH)
+    elif args.shadow:
+        registry.set_pointer(CANDIDATE, version)
+    else:
+        logging.info(f"Registered version {version}; use --promote or --shadow to serve it.")
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Train an intent classifier using support emails data.")
     parser.add_argument('--test_size', type=float, default=0.2, help='Proportion of the dataset to include in the test split')
     parser.add_argument('--random_state', type=int, default=42, help='Random state for train/test splitting')
+    parser.add_argument('--snapshot_dir', default=None, help='Load training data from columnar snapshots instead of SQLite')
+    parser.add_argument('--promote', action='store_true', help='Serve the new model version to all traffic')
+    parser.add_argument('--shadow', action='store_true', help='Evaluate the new model version in shadow mode')
     
     args = parser.parse_args()
     main(args)
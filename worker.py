@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+# worker.py
+import argparse
+import logging
+import sys
+import time
+import crew
+from agents.work_queue import WorkQueue
+
+def main(args):
+    queue = WorkQueue(visibility_timeout=args.visibility_timeout, max_attempts=args.max_attempts)
+    while True:
+        crew.drain_queue(queue, batch_size=args.batch_size)
+        if not args.follow:
+            break
+        time.sleep(args.poll_interval)
+
+    dead = queue.dead_letters()
+    if dead:
+        logging.warning("Worker: %d email(s) in the dead-letter list: %s", len(dead), [row[0] for row in dead])
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+
+    parser = argparse.ArgumentParser(description="Drain the email work queue through the processing agents.")
+    parser.add_argument('--batch_size', type=int, default=10, help='Number of emails leased per batch')
+    parser.add_argument('--visibility_timeout', type=float, default=300, help='Seconds before an unacked lease is retried')
+    parser.add_argument('--max_attempts', type=int, default=3, help='Attempts before an email is dead-lettered')
+    parser.add_argument('--follow', action='store_true', help='Keep polling the queue instead of exiting when empty')
+    parser.add_argument('--poll_interval', type=float, default=5, help='Seconds between polls with --follow')
+
+    args = parser.parse_args()
+    main(args)